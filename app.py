@@ -1,9 +1,20 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import smtplib
 import time
 import json
+import bisect
+import math
+import threading
+import logging
+from time import monotonic
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
+import numpy as np
+import orjson
+
 # ============================================================================
 # CONFIGURATION - UPDATE THESE VALUES
 # ============================================================================
@@ -14,6 +25,9 @@ from dotenv import load_dotenv
 # Load variables from .env for local development
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()  # Set to DEBUG to print per-check EMA values
+
 #########################
 # Telegram Configuration #
 #########################
@@ -24,6 +38,9 @@ EMA_FAST = 9
 EMA_SLOW = 15
 TIMEFRAME_MINUTES = int(os.getenv("TIMEFRAME_MINUTES", "1"))  # Iteration/sleep interval in minutes
 SIGNAL_TIMEFRAME_MINUTES = int(os.getenv("SIGNAL_TIMEFRAME_MINUTES", "15"))  # Candle timeframe used for signal calculation (e.g., 15)
+EMA_WINDOW = EMA_SLOW + 5  # Candles used for each EMA evaluation
+HISTORY_LIMIT = max(EMA_WINDOW + 1, 32)  # Candles fetched to seed a symbol (window + forming candle)
+SIGNAL_INTERVAL_MS = SIGNAL_TIMEFRAME_MINUTES * 60_000  # Spacing between consecutive signal candles
 
 ####################################
 # Market Data Configuration
@@ -44,6 +61,16 @@ TWELVEDATA_API_KEY = os.getenv("TWELVEDATA_API_KEY", TWELVEDATA_API_KEYS[0])
 
 TWELVEDATA_INTERVAL = os.getenv("TWELVEDATA_INTERVAL", "1min")  # e.g. 1min, 5min, 15min
 
+# Scans skipped on a key after a rate-limit (429) response: 1, doubling per consecutive 429, up to this cap
+TWELVEDATA_MAX_BACKOFF_SCANS = 8
+
+# Candles fetched once a symbol is seeded: enough to cover every candle that can close between two
+# fetches on a key (one scan interval plus the longest backoff), the last folded candle and the forming one
+UPDATE_LIMIT = min(
+    math.ceil((TWELVEDATA_MAX_BACKOFF_SCANS + 1) * TIMEFRAME_MINUTES / SIGNAL_TIMEFRAME_MINUTES) + 2,
+    HISTORY_LIMIT,
+)
+
 # Unified symbol list with provider
 # Assign two symbols per Twelve Data API key by default using api_key_idx (0, 1, 2)
 SYMBOLS = [
@@ -60,76 +87,303 @@ SYMBOLS = [
     {"provider": "twelvedata", "api_symbol": "XAU/USD", "label": "XAU/USD", "api_key_idx": 2},
 ]  # All pairs used for EMA calculation
 
+####################################
+# HTTP Configuration
+####################################
+
+# One pooled keep-alive session for all API calls so TLS handshakes are reused across symbols and ticks
+SESSION = requests.Session()
+SESSION.mount(
+    "https://",
+    HTTPAdapter(pool_connections=16, pool_maxsize=16, max_retries=Retry(total=3, backoff_factor=0.2, respect_retry_after_header=False)),
+)
+SESSION.headers.update({"Accept-Encoding": "gzip"})
+
+# Symbol groups are fetched in parallel each scan, so a tick waits on the slowest request instead of the sum of all
+FETCH_POOL = ThreadPoolExecutor(max_workers=8)
+
+# Alerts are sent in the background so a slow Telegram round trip doesn't hold up the rest of the scan
+ALERT_POOL = ThreadPoolExecutor(max_workers=2)
+
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
 
-def calculate_ema(prices, period):
+def ema_weights(period, length):
+    """
+    Closed-form EMA weights (oldest to newest) for a window of `length` prices.
+    Equivalent to seeding with the SMA of the first `period` prices and then
+    applying the EMA recurrence to the rest, so that EMA = weights @ prices.
+    """
+    alpha = 2 / (period + 1)
+    decay = (1 - alpha) ** np.arange(length - period, -1, -1)
+    weights = np.empty(length, dtype=np.float64)
+    weights[:period] = decay[0] / period  # SMA seed, decayed to the end of the window
+    weights[period:] = alpha * decay[1:]
+    return weights
+
+
+# Smoothing factors and weight vectors for the fixed evaluation window never change; build them once
+ALPHA_FAST = 2 / (EMA_FAST + 1)
+ALPHA_SLOW = 2 / (EMA_SLOW + 1)
+W_FAST = ema_weights(EMA_FAST, EMA_WINDOW)
+W_SLOW = ema_weights(EMA_SLOW, EMA_WINDOW)
+W_EMA = np.vstack((W_FAST, W_SLOW))  # Rows give both EMAs from a single matrix-vector product
+
+# Columns of the per-scan EMA levels block (one row per entry in SYMBOLS)
+PREV_FAST, PREV_SLOW, CUR_FAST, CUR_SLOW = range(4)
+
+
+def calculate_emas(prices):
+    """
+    Calculate the fast and slow EMAs over the last EMA_WINDOW prices in one pass
+    prices: float64 array of at least EMA_WINDOW prices (oldest to newest)
+    Returns: (ema_fast, ema_slow)
+    """
+    ema_fast, ema_slow = W_EMA @ prices[-EMA_WINDOW:]
+    return float(ema_fast), float(ema_slow)
+
+
+def ema_step(ema, price, alpha):
+    """Advance an EMA by one price using the recursive update with smoothing factor alpha."""
+    return (price - ema) * alpha + ema
+
+
+# Streaming EMA state per symbol, keyed by api_symbol:
+# {"ema_fast": float, "ema_slow": float, "last_ts": timestamp of the last closed candle folded in}
+ema_state = {}
+
+
+def update_ema_state(symbol, timestamps, closes):
     """
-    Calculate Exponential Moving Average
-    prices: list of prices (oldest to newest)
-    period: EMA period
+    Fold newly closed candles into the symbol's EMA state.
+    timestamps/closes run oldest to newest; the last candle is still forming, so it is never committed.
+
+    Returns: (prev_fast, prev_slow, ema_fast, ema_slow) where prev_* are the EMAs
+    through the last closed candle and ema_* also include the forming candle,
+    or None if there is not yet enough history to seed the EMAs.
     """
-    if len(prices) < period:
+    if len(closes) == 0:
         return None
-    
-    multiplier = 2 / (period + 1)
-    ema = sum(prices[:period]) / period  # SMA for first value
-    
-    for price in prices[period:]:
-        ema = (price - ema) * multiplier + ema
-    
-    return ema
+
+    closed_count = len(closes) - 1
+    state = ema_state.get(symbol)
+
+    if state is not None:
+        # Skip candles already folded in; timestamps are sorted, so the new ones are a suffix
+        first_new = bisect.bisect_right(timestamps, state["last_ts"], 0, closed_count)
+        if first_new == 0 and closed_count > 0 and timestamps[0] - state["last_ts"] > SIGNAL_INTERVAL_MS:
+            # Candles were missed between fetches; reseed from this fetch, or from history next scan
+            del ema_state[symbol]
+            state = None
+
+    if state is None:
+        if closed_count < EMA_WINDOW:
+            return None
+
+        # Seed from the most recent window once; later ticks only fold new candles
+        ema_fast, ema_slow = calculate_emas(closes[:closed_count])
+        state = {
+            "ema_fast": ema_fast,
+            "ema_slow": ema_slow,
+            "last_ts": timestamps[closed_count - 1],
+        }
+        ema_state[symbol] = state
+    else:
+        for i in range(first_new, closed_count):
+            price = float(closes[i])
+            state["ema_fast"] = ema_step(state["ema_fast"], price, ALPHA_FAST)
+            state["ema_slow"] = ema_step(state["ema_slow"], price, ALPHA_SLOW)
+        if first_new < closed_count:
+            state["last_ts"] = timestamps[closed_count - 1]
+
+    price = float(closes[-1])
+    ema_fast = ema_step(state["ema_fast"], price, ALPHA_FAST)
+    ema_slow = ema_step(state["ema_slow"], price, ALPHA_SLOW)
+
+    return state["ema_fast"], state["ema_slow"], ema_fast, ema_slow
+
+
+def parse_twelvedata_values(values):
+    """Convert Twelve Data `values` rows (newest first) to (timestamps, closes), oldest → newest.
+
+    timestamps is a list of epoch milliseconds; closes is a float64 array.
+    Returns None if any row has a missing or malformed datetime or close.
+    """
+    # Twelve Data returns newest first; reverse to oldest → newest
+    values = values[::-1]
+
+    timestamps = []
+    for v in values:
+        # datetime like '2024-01-01 12:34:00'
+        ts_str = v.get("datetime")
+        try:
+            dt = datetime.fromisoformat(ts_str)
+        except (TypeError, ValueError):
+            # Timestamps are compared against the streaming EMA state, so they must all be epoch ms
+            return None
+        timestamps.append(int(dt.timestamp() * 1000))
+
+    try:
+        closes = np.fromiter((v["close"] for v in values), dtype=np.float64, count=len(values))
+    except (KeyError, TypeError, ValueError):
+        return None
+
+    # fromiter turns a null close into NaN, which would poison the streaming EMA state for good
+    if not np.isfinite(closes).all():
+        return None
+
+    return timestamps, closes
+
+
+# Rate-limit backoff per Twelve Data API key: key -> (monotonic time requests resume, consecutive 429s)
+# Updated from FETCH_POOL workers, so read-modify-writes go through twelvedata_backoff_lock
+twelvedata_backoff = {}
+twelvedata_backoff_lock = threading.Lock()
 
 
-def fetch_twelvedata_ohlc(symbol, interval="15min", limit=500, api_key=None):
-    """Fetch OHLC data from Twelve Data for a given symbol.
+def twelvedata_rate_limited(key):
+    """Record a 429 for the API key and skip its next scans. Returns the number of scans skipped."""
+    with twelvedata_backoff_lock:
+        resume_at, strikes = twelvedata_backoff.get(key, (0.0, 0))
+        if monotonic() < resume_at:
+            # Another request on this key already hit the limit this scan; count one strike per event
+            return min(2 ** (strikes - 1), TWELVEDATA_MAX_BACKOFF_SCANS)
 
-    Returns: list of [timestamp, open, high, low, close]
+        strikes += 1
+        skip_scans = min(2 ** (strikes - 1), TWELVEDATA_MAX_BACKOFF_SCANS)
+        # Scans are aligned to interval boundaries; resume half an interval past the last skipped scan
+        # so the deadline never races the scan that should go ahead
+        delay = (skip_scans + 0.5) * TIMEFRAME_MINUTES * 60
+        twelvedata_backoff[key] = (monotonic() + delay, strikes)
+        return skip_scans
+
+
+def resolve_twelvedata_api_key(api_key_idx):
+    """Twelve Data API key for an api_key_idx: indexed key -> single-key env -> first key from list."""
+    api_key = None
+    if api_key_idx is not None and 0 <= api_key_idx < len(TWELVEDATA_API_KEYS):
+        api_key = TWELVEDATA_API_KEYS[api_key_idx]
+    return api_key or TWELVEDATA_API_KEY or (TWELVEDATA_API_KEYS[0] if TWELVEDATA_API_KEYS else None)
+
+
+def fetch_twelvedata_batch(symbols, interval="15min", limit=HISTORY_LIMIT, api_key=None):
+    """Fetch OHLC data from Twelve Data for several symbols in one request.
+
+    Returns: dict of symbol -> (timestamps, closes) (None for symbols that failed)
     """
-    # Determine which API key to use: explicit param -> single-key env -> first key from list
-    key = api_key or TWELVEDATA_API_KEY or (TWELVEDATA_API_KEYS[0] if TWELVEDATA_API_KEYS else None)
+    key = api_key or resolve_twelvedata_api_key(None)
     if not key:
         print("❌ Twelve Data Error: No API key available for Twelve Data.")
-        return None
+        return {}
 
     params = {
-        "symbol": symbol,
+        "symbol": ",".join(symbols),
         "interval": interval,
         "outputsize": limit,
         "apikey": key,
     }
 
-    resp = requests.get(TWELVEDATA_API_URL, params=params, timeout=10)
-    resp.raise_for_status()
-    data = resp.json()
+    # Skip fast while this key is backing off instead of spending a round trip on another 429
+    resume_at = twelvedata_backoff.get(key, (0.0, 0))[0]
+    if monotonic() < resume_at:
+        print(f"⏳ Twelve Data rate limited; skipping {params['symbol']} for {resume_at - monotonic():.0f}s")
+        return {}
 
-    if "values" not in data:
-        print(f"❌ Twelve Data Error for {symbol}: {data}")
-        return None
+    resp = SESSION.get(TWELVEDATA_API_URL, params=params, timeout=10)
+    if resp.status_code == 429:
+        data = {"code": 429, "status": "error"}
+    else:
+        resp.raise_for_status()
+        data = orjson.loads(resp.content)
 
-    values = data["values"]
+    # A single symbol (or a request-level error) comes back flat; a batch is keyed by symbol,
+    # and Twelve Data reports rate limits per symbol inside a batch
+    if len(symbols) == 1 or "code" in data:
+        rate_limited = data.get("code") == 429
+    else:
+        rate_limited = all((data.get(symbol) or {}).get("code") == 429 for symbol in symbols)
+
+    if rate_limited:
+        skip_scans = twelvedata_rate_limited(key)
+        print(f"❌ Twelve Data rate limit for {params['symbol']}: skipping next {skip_scans} scan(s) | {data}")
+        return {}
+
+    if len(symbols) == 1:
+        data = {symbols[0]: data}
+    elif "code" in data:
+        print(f"❌ Twelve Data Error for {params['symbol']}: {data}")
+        return {}
+
+    ohlc_by_symbol = {}
+    for symbol in symbols:
+        symbol_data = data.get(symbol) or {}
+        if "values" not in symbol_data:
+            print(f"❌ Twelve Data Error for {symbol}: {symbol_data}")
+            ohlc_by_symbol[symbol] = None
+            continue
+        ohlc = parse_twelvedata_values(symbol_data["values"])
+        if ohlc is None:
+            print(f"❌ Twelve Data Error for {symbol}: unparseable candles in response")
+        ohlc_by_symbol[symbol] = ohlc
+
+    # Only a response that actually returned data clears the key's backoff
+    if any(ohlc is not None for ohlc in ohlc_by_symbol.values()):
+        with twelvedata_backoff_lock:
+            twelvedata_backoff.pop(key, None)
+
+    return ohlc_by_symbol
+
+
+def group_symbols(symbols):
+    """Group SYMBOLS entries by provider and resolved API key so each key gets one request per scan."""
+    groups = {}
+    for cfg in symbols:
+        provider = cfg.get("provider", "binance")
+        # Group on the key actually used, so entries falling back to the same key share a request
+        api_key = resolve_twelvedata_api_key(cfg.get("api_key_idx")) if provider == "twelvedata" else None
+        groups.setdefault((provider, api_key), []).append(cfg)
+    return list(groups.values())
+
+
+def fetch_symbol_group(cfgs):
+    """Fetch signal-timeframe OHLC data for a group of Twelve Data SYMBOLS entries.
+
+    Returns: dict of api_symbol -> (timestamps, closes) (None or missing on failure)
+    """
+    api_symbols = [cfg["api_symbol"] for cfg in cfgs]
 
-    # Twelve Data returns newest first; reverse to oldest → newest
-    values = list(reversed(values))
+    # every entry in the group resolves to the same api key
+    api_key = resolve_twelvedata_api_key(cfgs[0].get("api_key_idx"))
+    signal_interval = f"{SIGNAL_TIMEFRAME_MINUTES}min"
 
-    ohlc = []
-    for v in values:
-        # datetime like '2024-01-01 12:34:00'
-        ts_str = v.get("datetime")
-        try:
-            dt = datetime.strptime(ts_str, "%Y-%m-%d %H:%M:%S")
-            timestamp = int(dt.timestamp() * 1000)
-        except Exception:
-            timestamp = ts_str
+    # Seeded symbols only need the latest candles; fetch full history only when something needs seeding
+    limit = UPDATE_LIMIT if all(symbol in ema_state for symbol in api_symbols) else HISTORY_LIMIT
 
-        open_price = float(v["open"])
-        high = float(v["high"])
-        low = float(v["low"])
-        close = float(v["close"])
-        ohlc.append([timestamp, open_price, high, low, close])
-
-    return ohlc
+    try:
+        return fetch_twelvedata_batch(api_symbols, signal_interval, limit, api_key=api_key)
+    except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
+        print(f"❌ Twelve Data Error for {', '.join(api_symbols)}: {e}")
+        return {}
+
+def seconds_until_next_scan(interval_seconds, jitter=0.5):
+    """Seconds to sleep so the next scan starts just after the next interval boundary (candle close)."""
+    now = time.time()
+    next_close = (int(now) // interval_seconds + 1) * interval_seconds
+    return max(0, next_close - now + jitter)
+
+# Alert request pieces that never change, built once. Plain text (no parse_mode) so labels
+# and subjects can't trip Telegram's Markdown parser.
+TELEGRAM_URL = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
+TELEGRAM_PAYLOAD = {"chat_id": TELEGRAM_CHAT_ID}
+ALERT_TEMPLATE = (
+    "{subject}\n\n"
+    "Signal: {direction}\n"
+    "EMA(9): {ema_fast:.2f}\n"
+    "EMA(15): {ema_slow:.2f}\n"
+    f"Timeframe: {SIGNAL_TIMEFRAME_MINUTES}-minute\n"
+    "Time: {time}"
+)
 
 def send_email_alert(subject, body, ema_fast, ema_slow, direction):
     """Send Telegram alert for EMA crossover (replaces email)."""
@@ -138,23 +392,16 @@ def send_email_alert(subject, body, ema_fast, ema_slow, direction):
         return False
 
     try:
-        text = (
-            f"{subject}\n\n"
-            f"Signal: {direction.upper()}\n"
-            f"EMA(9): {ema_fast:.2f}\n"
-            f"EMA(15): {ema_slow:.2f}\n"
-            f"Timeframe: {SIGNAL_TIMEFRAME_MINUTES}-minute\n"
-            f"Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+        text = ALERT_TEMPLATE.format(
+            subject=subject,
+            direction=direction.upper(),
+            ema_fast=ema_fast,
+            ema_slow=ema_slow,
+            time=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
         )
 
-        url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
-        payload = {
-            "chat_id": TELEGRAM_CHAT_ID,
-            "text": text,
-            "parse_mode": "Markdown",
-        }
-
-        response = requests.post(url, json=payload, timeout=10)
+        # Copy the base payload rather than mutating it; alerts are sent from several threads
+        response = SESSION.post(TELEGRAM_URL, json=dict(TELEGRAM_PAYLOAD, text=text), timeout=10)
         response.raise_for_status()
 
         print(f"✅ Telegram alert sent! | {direction.upper()} | EMA(9): ${ema_fast:.2f} | EMA(15): ${ema_slow:.2f}")
@@ -164,56 +411,39 @@ def send_email_alert(subject, body, ema_fast, ema_slow, direction):
         print(f"❌ Telegram Error: {e}")
         return False
 
-def check_ema_crossover(prices_list):
+def log_alert_result(future):
+    """Report background alerts that failed with an unexpected exception."""
+    exc = future.exception()
+    if exc is not None:
+        print(f"❌ Telegram Error: {exc}")
+
+def check_ema_crossovers(levels, labels):
     """
-    Check for EMA crossover
-    Returns: 'bullish' (9 > 15), 'bearish' (9 < 15), or None
+    Check every symbol for an EMA crossover at once
+    levels: (n_symbols, 4) array with columns PREV_FAST, PREV_SLOW, CUR_FAST, CUR_SLOW (NaN rows never cross)
+    labels: symbol label for each row, used in debug output
+    Returns: (bullish, bearish) boolean masks - 9 crosses above 15 / 9 crosses below 15
     """
-    if len(prices_list) < EMA_SLOW + 5:  # Need enough data for both EMAs
-        return None, None, None
-    
-    # Calculate current EMAs (using last EMA_SLOW + 5 candles for stability)
-    recent_prices = prices_list[-(EMA_SLOW + 5):]
-    
-    ema_fast_current = calculate_ema(recent_prices, EMA_FAST)
-    ema_slow_current = calculate_ema(recent_prices, EMA_SLOW)
-    
-    if ema_fast_current is None or ema_slow_current is None:
-        return None, ema_fast_current, ema_slow_current
-    
-    # Calculate previous candle EMAs (one candle back)
-    prev_prices = prices_list[-(EMA_SLOW + 6):-1]
-    
-    if len(prev_prices) < EMA_SLOW:
-        ema_fast_prev = None
-        ema_slow_prev = None
-    else:
-        ema_fast_prev = calculate_ema(prev_prices, EMA_FAST)
-        ema_slow_prev = calculate_ema(prev_prices, EMA_SLOW)
-    
-    # Detect crossover
-    crossover = None
-    
-    if ema_fast_prev is not None and ema_slow_prev is not None:
-        # Bullish crossover: EMA9 crosses above EMA15
-        if ema_fast_prev <= ema_slow_prev and ema_fast_current > ema_slow_current:
-            crossover = 'bullish'
-        
-        # Bearish crossover: EMA9 crosses below EMA15
-        elif ema_fast_prev >= ema_slow_prev and ema_fast_current < ema_slow_current:
-            crossover = 'bearish'
-
-    # Debug output for EMA values each check
-    prev_fast_str = f"{ema_fast_prev:.6f}" if ema_fast_prev is not None else "N/A"
-    prev_slow_str = f"{ema_slow_prev:.6f}" if ema_slow_prev is not None else "N/A"
-    curr_fast_str = f"{ema_fast_current:.6f}" if ema_fast_current is not None else "N/A"
-    curr_slow_str = f"{ema_slow_current:.6f}" if ema_slow_current is not None else "N/A"
-    print(
-        f"DEBUG EMA | prev_fast={prev_fast_str} prev_slow={prev_slow_str} "
-        f"curr_fast={curr_fast_str} curr_slow={curr_slow_str} crossover={crossover}"
-    )
-
-    return crossover, ema_fast_current, ema_slow_current
+    prev_fast, prev_slow, cur_fast, cur_slow = levels.T
+
+    # Bullish crossover: EMA9 crosses above EMA15
+    bullish = (prev_fast <= prev_slow) & (cur_fast > cur_slow)
+
+    # Bearish crossover: EMA9 crosses below EMA15
+    bearish = (prev_fast >= prev_slow) & (cur_fast < cur_slow)
+
+    # Debug output for EMA values each check (skipped entirely unless DEBUG is enabled)
+    if logger.isEnabledFor(logging.DEBUG):
+        for label, row, is_bullish, is_bearish in zip(labels, levels, bullish, bearish):
+            if np.isnan(row).any():
+                continue
+            crossover = 'bullish' if is_bullish else 'bearish' if is_bearish else None
+            logger.debug(
+                "EMA | %s | prev_fast=%.6f prev_slow=%.6f curr_fast=%.6f curr_slow=%.6f crossover=%s",
+                label, *row, crossover,
+            )
+
+    return bullish, bearish
 
 # ============================================================================
 # MAIN MONITORING LOOP
@@ -223,6 +453,10 @@ def main():
     """
     Main monitoring loop - runs continuously
     """
+    # Only the app's own logger follows LOG_LEVEL; library debug output (urllib3 logs full request
+    # URLs, including the Twelve Data apikey and Telegram bot token) stays off
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+    logger.setLevel(LOG_LEVEL)
     print("=" * 70)
     print("🚀 BTC/USD EMA(9,15) Crossover Alert System Started")
     print("=" * 70)
@@ -235,51 +469,64 @@ def main():
     # Track last alert per symbol to avoid duplicate alerts
     sleep_seconds = TIMEFRAME_MINUTES * 60
     last_alert_timestamp = {}  # key: label or api_symbol
+    labels = [cfg["label"] for cfg in SYMBOLS]
+    symbol_groups = []
+    for cfgs in group_symbols(SYMBOLS):
+        provider = cfgs[0].get("provider", "binance")
+        if provider != "twelvedata":
+            print(f"Unknown provider '{provider}' for {', '.join(cfg['label'] for cfg in cfgs)}. Skipping.")
+            continue
+        symbol_groups.append(cfgs)
 
     while True:
         now = datetime.now()
-        for cfg in SYMBOLS:
-            api_symbol = cfg["api_symbol"]
+        # Log from here rather than the fetch workers so lines from concurrent groups don't interleave
+        for cfgs in symbol_groups:
+            group_labels = ", ".join(cfg["label"] for cfg in cfgs)
+            print(f"[{now.strftime('%Y-%m-%d %H:%M:%S')}] Fetching {SIGNAL_TIMEFRAME_MINUTES}m data for {group_labels} from twelvedata...")
+
+        ohlc_by_symbol = {}
+        for group_ohlc in FETCH_POOL.map(fetch_symbol_group, symbol_groups):
+            ohlc_by_symbol.update(group_ohlc)
+
+        # Symbols without fresh EMAs this scan stay NaN, which never compares as a crossover
+        levels = np.full((len(SYMBOLS), 4), np.nan)
+
+        for i, cfg in enumerate(SYMBOLS):
             label = cfg["label"]
-            provider = cfg.get("provider", "binance")
-
-            print(f"[{now.strftime('%Y-%m-%d %H:%M:%S')}] Fetching {SIGNAL_TIMEFRAME_MINUTES}m data for {label} ({api_symbol}) from {provider}...")
-
-            if provider == "twelvedata":
-                # pick api key for this symbol (if set)
-                api_key_idx = cfg.get("api_key_idx")
-                api_key = None
-                if api_key_idx is not None and 0 <= api_key_idx < len(TWELVEDATA_API_KEYS):
-                    api_key = TWELVEDATA_API_KEYS[api_key_idx]
-                signal_interval = f"{SIGNAL_TIMEFRAME_MINUTES}min"
-                ohlc_data = fetch_twelvedata_ohlc(api_symbol, signal_interval, api_key=api_key)
-            else:
-                print(f"Unknown provider '{provider}' for {label}. Skipping.")
-                continue
+            ohlc_data = ohlc_by_symbol.get(cfg["api_symbol"])
 
-            if not ohlc_data or len(ohlc_data) < EMA_SLOW + 5:
+            ema_levels = update_ema_state(cfg["api_symbol"], *ohlc_data) if ohlc_data else None
+            if ema_levels is None:
                 print(f"Not enough data received for {label}. Skipping this symbol.")
                 continue
 
-            closes = [candle[4] for candle in ohlc_data]
-
-            crossover, ema_fast, ema_slow = check_ema_crossover(closes)
-
-            if crossover and ema_fast is not None and ema_slow is not None:
-                last_ts = last_alert_timestamp.get(api_symbol)
-                if last_ts is None or (now - last_ts).total_seconds() > sleep_seconds:
-                    subject = f"🚨 {label} EMA Crossover Alert - {crossover.upper()}"
-                    body = f"{label} EMA(9) has crossed {'above' if crossover == 'bullish' else 'below'} EMA(15)"
-                    send_email_alert(subject, body, ema_fast, ema_slow, crossover)
-                    last_alert_timestamp[api_symbol] = now
+            levels[i] = ema_levels
 
             # Optional: print per‑symbol status
-            ema_fast_str = f"{ema_fast:.2f}" if ema_fast is not None else "N/A"
-            ema_slow_str = f"{ema_slow:.2f}" if ema_slow is not None else "N/A"
-            print(f"{label} | EMA(9): ${ema_fast_str} | EMA(15): ${ema_slow_str}")
-
-        print(f"Waiting {TIMEFRAME_MINUTES} minutes before next multi‑symbol scan...")
-        time.sleep(sleep_seconds)
+            print(f"{label} | EMA(9): ${levels[i, CUR_FAST]:.2f} | EMA(15): ${levels[i, CUR_SLOW]:.2f}")
+
+        bullish, bearish = check_ema_crossovers(levels, labels)
+
+        for i in np.flatnonzero(bullish | bearish):
+            api_symbol = SYMBOLS[i]["api_symbol"]
+            label = SYMBOLS[i]["label"]
+            crossover = 'bullish' if bullish[i] else 'bearish'
+
+            last_ts = last_alert_timestamp.get(api_symbol)
+            # Scans are aligned to interval boundaries, so consecutive scans are exactly one interval apart
+            if last_ts is None or (now - last_ts).total_seconds() > sleep_seconds / 2:
+                subject = f"🚨 {label} EMA Crossover Alert - {crossover.upper()}"
+                body = f"{label} EMA(9) has crossed {'above' if crossover == 'bullish' else 'below'} EMA(15)"
+                ema_fast = float(levels[i, CUR_FAST])
+                ema_slow = float(levels[i, CUR_SLOW])
+                alert = ALERT_POOL.submit(send_email_alert, subject, body, ema_fast, ema_slow, crossover)
+                alert.add_done_callback(log_alert_result)
+                last_alert_timestamp[api_symbol] = now
+
+        wait_seconds = seconds_until_next_scan(sleep_seconds)
+        print(f"Waiting {wait_seconds:.1f} seconds for the next {TIMEFRAME_MINUTES}-minute candle close before next multi‑symbol scan...")
+        time.sleep(wait_seconds)
                 
 
 if __name__ == "__main__":
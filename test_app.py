@@ -0,0 +1,177 @@
+import numpy as np
+import orjson
+import pytest
+
+import app
+
+
+def sma_seeded_ema(prices, period):
+    """Baseline EMA recurrence: SMA seed over the first `period` prices, then the EMA update."""
+    multiplier = 2 / (period + 1)
+    ema = sum(prices[:period]) / period
+    for price in prices[period:]:
+        ema = (price - ema) * multiplier + ema
+    return ema
+
+
+def candles(count, start=0):
+    """Evenly spaced signal-timeframe timestamps and random closes."""
+    rng = np.random.default_rng(start)
+    timestamps = [(start + i) * app.SIGNAL_INTERVAL_MS for i in range(count)]
+    return timestamps, rng.uniform(1, 2, count)
+
+
+def values_rows(count):
+    """Twelve Data `values` rows, newest first."""
+    return [
+        {"datetime": f"2024-01-01 {i // 60:02d}:{i % 60:02d}:00", "close": str(1 + i / 100)}
+        for i in reversed(range(count))
+    ]
+
+
+class FakeResponse:
+    def __init__(self, data, status_code=200):
+        self.content = orjson.dumps(data)
+        self.status_code = status_code
+
+    def raise_for_status(self):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def fresh_state(monkeypatch):
+    monkeypatch.setattr(app, "ema_state", {})
+    monkeypatch.setattr(app, "twelvedata_backoff", {})
+
+
+@pytest.fixture
+def twelvedata_response(monkeypatch):
+    """Serve the given JSON body for every Twelve Data request."""
+    def serve(data, status_code=200):
+        monkeypatch.setattr(app.SESSION, "get", lambda *args, **kwargs: FakeResponse(data, status_code))
+    return serve
+
+
+@pytest.mark.parametrize("period", [app.EMA_FAST, app.EMA_SLOW])
+@pytest.mark.parametrize("length", [app.EMA_SLOW, app.EMA_WINDOW, 40])
+def test_ema_weights_match_sma_seeded_recurrence(period, length):
+    prices = np.random.default_rng(length).uniform(1, 2, length)
+    assert app.ema_weights(period, length) @ prices == pytest.approx(sma_seeded_ema(list(prices), period))
+
+
+def test_calculate_emas_uses_last_window():
+    prices = np.random.default_rng(1).uniform(1, 2, 30)
+    window = list(prices[-app.EMA_WINDOW:])
+    ema_fast, ema_slow = app.calculate_emas(prices)
+    assert ema_fast == pytest.approx(sma_seeded_ema(window, app.EMA_FAST))
+    assert ema_slow == pytest.approx(sma_seeded_ema(window, app.EMA_SLOW))
+
+
+def test_update_ema_state_needs_a_full_window_to_seed():
+    timestamps, closes = candles(app.EMA_WINDOW)  # one short: the last candle is still forming
+    assert app.update_ema_state("X", timestamps, closes) is None
+    assert "X" not in app.ema_state
+
+
+def test_update_ema_state_seeds_from_closed_candles():
+    timestamps, closes = candles(app.HISTORY_LIMIT)
+    prev_fast, prev_slow, ema_fast, ema_slow = app.update_ema_state("X", timestamps, closes)
+
+    window = list(closes[-app.EMA_WINDOW - 1:-1])
+    assert prev_fast == pytest.approx(sma_seeded_ema(window, app.EMA_FAST))
+    assert prev_slow == pytest.approx(sma_seeded_ema(window, app.EMA_SLOW))
+    assert ema_fast == pytest.approx(app.ema_step(prev_fast, closes[-1], app.ALPHA_FAST))
+    assert ema_slow == pytest.approx(app.ema_step(prev_slow, closes[-1], app.ALPHA_SLOW))
+    assert app.ema_state["X"]["last_ts"] == timestamps[-2]
+
+
+def test_update_ema_state_folds_only_new_closed_candles():
+    timestamps, closes = candles(40)
+    seeded = app.update_ema_state("X", timestamps[:32], closes[:32])
+
+    # Overlapping fetch: candle 30 is already folded, 31 has now closed, 32 is forming
+    prev_fast, prev_slow, _, _ = app.update_ema_state("X", timestamps[30:33], closes[30:33])
+    assert prev_fast == pytest.approx(app.ema_step(seeded[0], closes[31], app.ALPHA_FAST))
+    assert prev_slow == pytest.approx(app.ema_step(seeded[1], closes[31], app.ALPHA_SLOW))
+    assert app.ema_state["X"]["last_ts"] == timestamps[31]
+
+    # Same candles again: nothing new to fold
+    assert app.update_ema_state("X", timestamps[30:33], closes[30:33])[:2] == (prev_fast, prev_slow)
+
+
+def test_update_ema_state_accepts_the_next_candle_without_overlap():
+    timestamps, closes = candles(40)
+    app.update_ema_state("X", timestamps[:32], closes[:32])
+
+    # Candle 31 directly follows the last folded candle (30), so nothing was missed
+    assert app.update_ema_state("X", timestamps[31:34], closes[31:34]) is not None
+    assert app.ema_state["X"]["last_ts"] == timestamps[32]
+
+
+def test_update_ema_state_drops_state_after_a_gap():
+    timestamps, closes = candles(60)
+    app.update_ema_state("X", timestamps[:32], closes[:32])
+
+    assert app.update_ema_state("X", timestamps[40:43], closes[40:43]) is None
+    assert "X" not in app.ema_state
+
+
+def test_update_ema_state_reseeds_from_a_gapped_fetch_with_enough_history():
+    timestamps, closes = candles(80)
+    app.update_ema_state("X", timestamps[:32], closes[:32])
+
+    prev_fast, _, _, _ = app.update_ema_state("X", timestamps[40:72], closes[40:72])
+    assert prev_fast == pytest.approx(sma_seeded_ema(list(closes[51:71]), app.EMA_FAST))
+    assert app.ema_state["X"]["last_ts"] == timestamps[70]
+
+
+def test_fetch_twelvedata_batch_single_symbol_flat_response(twelvedata_response):
+    twelvedata_response({"meta": {}, "values": values_rows(3), "status": "ok"})
+
+    result = app.fetch_twelvedata_batch(["BTC/USD"], api_key="k")
+
+    timestamps, closes = result["BTC/USD"]
+    assert timestamps == sorted(timestamps)
+    assert closes.tolist() == [1.0, 1.01, 1.02]
+
+
+def test_fetch_twelvedata_batch_keyed_batch(twelvedata_response):
+    twelvedata_response({
+        "BTC/USD": {"values": values_rows(2), "status": "ok"},
+        "USD/JPY": {"code": 400, "message": "bad symbol", "status": "error"},
+    })
+
+    result = app.fetch_twelvedata_batch(["BTC/USD", "USD/JPY"], api_key="k")
+
+    assert result["BTC/USD"][1].tolist() == [1.0, 1.01]
+    assert result["USD/JPY"] is None
+    assert app.twelvedata_backoff == {}
+
+
+def test_fetch_twelvedata_batch_per_symbol_429_backs_off(twelvedata_response):
+    twelvedata_response({
+        "BTC/USD": {"code": 429, "status": "error"},
+        "USD/JPY": {"code": 429, "status": "error"},
+    })
+
+    assert app.fetch_twelvedata_batch(["BTC/USD", "USD/JPY"], api_key="k") == {}
+    assert app.twelvedata_backoff["k"][1] == 1
+
+    # While backing off the key is skipped without a request
+    twelvedata_response({"BTC/USD": {"values": values_rows(2)}, "USD/JPY": {"values": values_rows(2)}})
+    assert app.fetch_twelvedata_batch(["BTC/USD", "USD/JPY"], api_key="k") == {}
+
+
+def test_fetch_twelvedata_batch_request_level_error(twelvedata_response):
+    twelvedata_response({"code": 401, "message": "invalid api key", "status": "error"})
+
+    assert app.fetch_twelvedata_batch(["BTC/USD", "USD/JPY"], api_key="k") == {}
+    assert app.twelvedata_backoff == {}
+
+
+def test_fetch_twelvedata_batch_rejects_null_close(twelvedata_response):
+    rows = values_rows(2)
+    rows[0]["close"] = None
+    twelvedata_response({"values": rows, "status": "ok"})
+
+    assert app.fetch_twelvedata_batch(["BTC/USD"], api_key="k") == {"BTC/USD": None}